@@ -1,12 +1,19 @@
+import asyncio
+import os
 import socket
+import stat
 import struct
 import sys
-
-_sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+import time
+from types import TracebackType
+from typing import List, Optional, Sequence, Type, Union
 
 PNS_PRODUCT_ID = b'AB'
 """product category"""
 
+PNS_DEFAULT_PORT = 10000
+"""default port number of LR5-LAN"""
+
 # PNS command identifier
 PNS_RUN_CONTROL_COMMAND = b'S'
 """operation control command"""
@@ -49,12 +56,53 @@ PNS_RUN_CONTROL_BUZZER_RING = 0x01
 PNS_RUN_CONTROL_BUZZER_NO_CHANGE = 0x09
 """no change"""
 
+# compiled formats of PNS command data
+_HDR = struct.Struct('>2ssxH')
+"""header (product category, command identifier, data size)"""
+_RUN_PAYLOAD = struct.Struct('BBBBBB')
+"""data area of operation control command"""
+
+# fixed PNS command data built once at import
+_RUN_HEADER = _HDR.pack(PNS_PRODUCT_ID, PNS_RUN_CONTROL_COMMAND, 6)
+"""header of operation control command"""
+_RUN_TEMPLATE = _RUN_HEADER + bytes(_RUN_PAYLOAD.size)
+"""operation control command with an empty data area (filled in place with pack_into)"""
+_CLEAR_PACKET = _HDR.pack(PNS_PRODUCT_ID, PNS_CLEAR_COMMAND, 0)
+"""clear command"""
+_GET_PACKET = _HDR.pack(PNS_PRODUCT_ID, PNS_GET_DATA_COMMAND, 0)
+"""get status command"""
+
+
+def _check_ack(response: int) -> None:
+    # ACK is the normal case; anything else is an error
+    if response == PNS_ACK:
+        return
+    if response == PNS_NAK:
+        raise ValueError('negative acknowledge')
+    raise ValueError('invalid response')
+
+
+def _check_acks(recv_data: bytearray, count: int) -> None:
+    # every command of a batch must be acknowledged
+    if recv_data.count(PNS_ACK) != count:
+        if PNS_NAK in recv_data:
+            raise ValueError('negative acknowledge')
+        raise ValueError('invalid response')
+
+
+def _is_byte(value: object) -> bool:
+    # integer from 0 to 255 (bool counts as 0/1, as it does in a NumPy integer conversion)
+    return isinstance(value, int) and 0 <= value <= 0xFF
+
 
 class PnsRunControlData:
     """operation control data class"""
 
+    __slots__ = ('_led_red_pattern', '_led_amber_pattern', '_led_green_pattern', '_led_blue_pattern', '_led_white_pattern',
+                 '_buzzer_mode')
+
     def __init__(self, led_red_pattern: int, led_amber_pattern: int, led_green_pattern: int, led_blue_pattern: int, led_white_pattern: int,
-                 buzzer_mode: int):
+                 buzzer_mode: int) -> None:
         """
         operation control data class
 
@@ -80,46 +128,57 @@ class PnsRunControlData:
         self._led_white_pattern = led_white_pattern
         self._buzzer_mode = buzzer_mode
 
-    def get_bytes(self) -> bytes:
+    def pack_into(self, buffer: bytearray, offset: int) -> None:
         """
-        Get the binary data of the operation control data.
+        Write the binary data of the operation control data into a buffer.
 
-        Returns
-        -------
-        data: bytes
-            Binary data of operation control data
-        """
-        data = struct.pack(
-            'BBBBBB',               # format
-            self._led_red_pattern,     # LED Red pattern
-            self._led_amber_pattern,     # LED Amber pattern
-            self._led_green_pattern,     # LED Green pattern
+        Parameters
+        ----------
+        buffer: bytearray
+            buffer to write to
+        offset: int
+            position in the buffer to write the data at
+        """
+        _RUN_PAYLOAD.pack_into(
+            buffer,
+            offset,
+            self._led_red_pattern,      # LED Red pattern
+            self._led_amber_pattern,    # LED Amber pattern
+            self._led_green_pattern,    # LED Green pattern
             self._led_blue_pattern,     # LED Blue pattern
-            self._led_white_pattern,     # LED White pattern
-            self._buzzer_mode,   # buzzer mode
+            self._led_white_pattern,    # LED White pattern
+            self._buzzer_mode,          # buzzer mode
         )
-        return data
 
 
 class PnsStatusData:
     """status data of operation control"""
 
-    def __init__(self, data: bytes):
+    __slots__ = ('_ledPattern', '_buzzer')
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]) -> None:
         """
         status data of operation control
 
+        The LED pattern is a view of the response data without copying, so data must not be modified
+        while the status is in use. get_data() passes a copy of the response for this reason.
+
         Parameters
         ----------
-        data: bytes
+        data: bytes, bytearray or memoryview
             Response data for get status command
         """
-        self._ledPattern = data[0:5]
-        self._buzzer = int(data[5])
+        self._ledPattern = memoryview(data)[0:5]
+        self._buzzer = data[5]
+
+    def __getitem__(self, index: int) -> int:
+        """LED Pattern of the unit at index (0 to 4)"""
+        return self._ledPattern[index]
 
     @property
-    def ledPattern(self) -> bytes:
+    def ledPattern(self) -> memoryview:
         """LED Pattern 1 to 5"""
-        return self._ledPattern[:]
+        return self._ledPattern
 
     @property
     def buzzer(self) -> int:
@@ -127,55 +186,663 @@ class PnsStatusData:
         return self._buzzer
 
 
-def main():
+def build_sequence(frames: Sequence[Sequence[int]]) -> bytes:
+    """
+    Build the operation control commands of a whole LED sequence in one buffer
+
+    NumPy is used to fill the buffer when it is installed; otherwise the frames are packed one by one.
+
+    Parameters
+    ----------
+    frames: Sequence[Sequence[int]]
+        N frames of 6 values each (LED Red/Amber/Green/Blue/White pattern, buzzer mode),
+        e.g. a (N, 6) uint8 numpy.ndarray
+
+    Returns
+    -------
+    data: bytes
+        N operation control commands (12 bytes each)
+
+    Raises
+    ------
+    ValueError
+        If frames is not N frames of 6 integers from 0 to 255
+    """
+    if len(frames) == 0:
+        return b''
+
+    try:
+        import numpy as np
+    except ImportError:
+        # pack the frames one by one into the command templates
+        data = bytearray(_RUN_TEMPLATE * len(frames))
+        offset = _HDR.size
+        for frame in frames:
+            if not (isinstance(frame, Sequence) and len(frame) == _RUN_PAYLOAD.size and all(_is_byte(value) for value in frame)):
+                raise ValueError('frames must be N frames of 6 integers from 0 to 255')
+            _RUN_PAYLOAD.pack_into(data, offset, *frame)
+            offset += len(_RUN_TEMPLATE)
+        return bytes(data)
+
+    # convert without a dtype so that floats and out-of-range values are not silently cast
+    values = np.asarray(frames)
+    if (values.ndim != 2 or values.shape[1] != _RUN_PAYLOAD.size or values.dtype.kind not in 'biu'
+            or values.min() < 0 or values.max() > 0xFF):
+        raise ValueError('frames must be N frames of 6 integers from 0 to 255')
+
+    # copy the header to every row and the frames to the data areas in two vectorized fills
+    buf = np.empty((len(values), len(_RUN_TEMPLATE)), dtype=np.uint8)
+    buf[:, :_HDR.size] = np.frombuffer(_RUN_HEADER, dtype=np.uint8)
+    buf[:, _HDR.size:] = values.astype(np.uint8)
+    return buf.tobytes()
+
+
+class PnsConnection:
+    """TCP connection to one LR5-LAN"""
+
+    def __init__(self, ip: str, port: int = PNS_DEFAULT_PORT) -> None:
+        """
+        TCP connection to one LR5-LAN
+
+        Parameters
+        ----------
+        ip: str
+            IP address
+        port: int
+            port number
+        """
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # receive buffer reused for every response
+        self._recvbuf = bytearray(16)
+        self._recvmv = memoryview(self._recvbuf)
+        # operation control command whose data area is overwritten for every command
+        self._run_frame = bytearray(_RUN_TEMPLATE)
+
+        # Disable Nagle's algorithm so each command is sent without waiting for the previous ACK
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            self._sock.connect((ip, port))
+        except OSError:
+            self._sock.close()
+            raise
+
+    def __enter__(self) -> 'PnsConnection':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the socket.
+        """
+        # Shut down both directions first so the FIN is sent before the descriptor is freed
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            # already disconnected
+            pass
+        self._sock.close()
+
+    def send_command(self, send_data: Union[bytes, bytearray], expected_len: int) -> bytes:
+        """
+        Send command
+
+        Parameters
+        ----------
+        send_data: bytes
+            send data
+        expected_len: int
+            length of the response data (a NAK response is always 1 byte)
+
+        Returns
+        -------
+        recv_data: bytes
+            received data
+        """
+        return bytes(self._command(send_data, expected_len))
+
+    def _command(self, send_data: Union[bytes, bytearray], expected_len: int) -> memoryview:
+        # Send, then receive the response into the reused buffer (the returned view is valid until the next command)
+        self._sock.sendall(send_data)
+
+        # Receive response data
+        recv_len = 0
+        while recv_len < expected_len:
+            n = self._sock.recv_into(self._recvmv[recv_len:expected_len])
+            if n == 0:
+                raise ConnectionError('connection closed by LR5-LAN')
+            recv_len += n
+            if self._recvbuf[0] == PNS_NAK:
+                break
+
+        return self._recvmv[:recv_len]
+
+    def _send_batch(self, send_data: Union[bytes, bytearray], count: int) -> bytearray:
+        # Send several PNS commands, one response byte is returned per command
+        self._sock.sendall(send_data)
+
+        recv_data = bytearray(count)
+        recv_mv = memoryview(recv_data)
+        recv_len = 0
+        while recv_len < count:
+            n = self._sock.recv_into(recv_mv[recv_len:])
+            if n == 0:
+                raise ConnectionError('connection closed by LR5-LAN')
+            recv_len += n
+
+        return recv_data
+
+    def run_sequence(self, sequence: bytes) -> None:
+        """
+        Send the operation control commands built by build_sequence() in a single write
+
+        Parameters
+        ----------
+        sequence: bytes
+            operation control commands built by build_sequence()
+
+        Raises
+        ------
+        ValueError
+            If the length of sequence is not a multiple of the command length (12 bytes)
+        """
+        count, remainder = divmod(len(sequence), len(_RUN_TEMPLATE))
+        if remainder != 0:
+            raise ValueError('sequence must consist of whole operation control commands')
+        if count == 0:
+            return
+
+        # Send PNS commands
+        recv_data = self._send_batch(sequence, count)
+
+        # check the response data
+        _check_acks(recv_data, count)
+
+    def run_control(self, run_control_data: PnsRunControlData) -> None:
+        """
+        Send operation control command for PNS command
+
+        Each color of the LED unit and the buzzer can be controlled by the pattern specified in the data area
+
+        Parameters
+        ----------
+        run_control_data: PnsRunControlData
+            Red/amber/green/blue/white LED unit operation patterns, buzzer mode
+        """
+        # Create the data to be sent (the header is already in the frame)
+        run_control_data.pack_into(self._run_frame, _HDR.size)
+
+        # Send PNS command
+        recv_data = self._command(self._run_frame, 1)
+
+        # check the response data
+        _check_ack(recv_data[0])
+
+    def clear(self) -> None:
+        """
+        Send clear command for PNS command
+
+        Turn off the LED unit and stop the buzzer
+        """
+        # Send PNS command
+        recv_data = self._command(_CLEAR_PACKET, 1)
+
+        # check the response data
+        _check_ack(recv_data[0])
+
+    def get_data(self) -> 'PnsStatusData':
+        """
+        Send status acquisition command for PNS command
+
+        Returns
+        -------
+        status_data: PnsStatusData
+            Received data of status acquisition command (status of LED unit and buzzer)
+        """
+        # copy the response out of the receive buffer that the next command overwrites
+        return PnsStatusData(bytes(self._get_data_view()))
+
+    def _get_data_view(self) -> memoryview:
+        # Send PNS command (the returned view is valid until the next command)
+        recv_data = self._command(_GET_PACKET, 6)
+
+        # check the response data
+        if recv_data[0] == PNS_NAK:
+            raise ValueError('negative acknowledge')
+
+        return recv_data
+
+
+class PnsBatch:
+    """batch of PNS commands sent in a single write"""
+
+    def __init__(self, interval: Optional[float] = None, connection: Optional[PnsConnection] = None) -> None:
+        """
+        batch of PNS commands sent in a single write
+
+        Operation control and clear commands are accumulated and sent together by flush().
+        The responses (one ACK/NAK byte per command) are received after the send.
+
+        Parameters
+        ----------
+        interval: float
+            If specified, the batch is flushed automatically by add_run()/add_clear()
+            once this many seconds have passed since the first pending command
+        connection: PnsConnection
+            connection to send the commands on (the connection opened by socket_open() if omitted)
+        """
+        self._connection = connection
+        self._buf = bytearray()
+        self._count = 0
+        self._interval = interval
+        self._first_time = 0.0
+
+    def __enter__(self) -> 'PnsBatch':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_run(self, run_control_data: PnsRunControlData) -> None:
+        """
+        Add an operation control command
+
+        Parameters
+        ----------
+        run_control_data: PnsRunControlData
+            Red/amber/green/blue/white LED unit operation patterns, buzzer mode
+        """
+        offset = len(self._buf)
+        self._buf += _RUN_TEMPLATE
+        try:
+            run_control_data.pack_into(self._buf, offset + _HDR.size)
+        except struct.error:
+            # remove the incomplete command so the buffer matches the command count
+            del self._buf[offset:]
+            raise
+        self._added()
+
+    def add_clear(self) -> None:
+        """
+        Add a clear command
+        """
+        self._buf += _CLEAR_PACKET
+        self._added()
+
+    def _added(self) -> None:
+        now = time.monotonic()
+        if self._count == 0:
+            self._first_time = now
+        self._count += 1
+        if self._interval is not None and now - self._first_time >= self._interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send all pending commands and check the responses
+        """
+        if self._count == 0:
+            return
+
+        send_data = self._buf
+        count = self._count
+        self._buf = bytearray()
+        self._count = 0
+
+        # Send PNS commands
+        connection = self._connection if self._connection is not None else _get_connection()
+        recv_data = connection._send_batch(send_data, count)
+
+        # check the response data
+        _check_acks(recv_data, count)
+
+
+class PnsClient:
+    """asyncio connection to one LR5-LAN"""
+
+    def __init__(self, ip: str, port: int = PNS_DEFAULT_PORT) -> None:
+        """
+        asyncio connection to one LR5-LAN
+
+        Several clients can be operated concurrently with asyncio.gather().
+
+        Parameters
+        ----------
+        ip: str
+            IP address
+        port: int
+            port number
+        """
+        self._ip = ip
+        self._port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # operation control command whose data area is overwritten for every command
+        self._run_frame = bytearray(_RUN_TEMPLATE)
+
+    async def __aenter__(self) -> 'PnsClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        await self.close()
+
+    @property
+    def ip(self) -> str:
+        """IP address"""
+        return self._ip
+
+    async def open(self) -> None:
+        """
+        Connect to LR5-LAN
+        """
+        self._reader, self._writer = await asyncio.open_connection(self._ip, self._port)
+        sock = self._writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    async def close(self) -> None:
+        """
+        Close the connection.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = None
+            self._writer = None
+
+    async def send_command(self, send_data: Union[bytes, bytearray], expected_len: int) -> bytes:
+        """
+        Send command
+
+        Parameters
+        ----------
+        send_data: bytes
+            send data
+        expected_len: int
+            length of the response data (a NAK response is always 1 byte)
+
+        Returns
+        -------
+        recv_data: bytes
+            received data
+        """
+        reader = self._reader
+        writer = self._writer
+        if reader is None or writer is None:
+            raise ConnectionError('not connected to LR5-LAN')
+
+        # Send
+        writer.write(send_data)
+        await writer.drain()
+
+        # Receive response data
+        recv_data = await reader.readexactly(1)
+        if recv_data[0] != PNS_NAK and expected_len > 1:
+            recv_data += await reader.readexactly(expected_len - 1)
+
+        return recv_data
+
+    async def run_control(self, run_control_data: PnsRunControlData) -> None:
+        """
+        Send operation control command for PNS command
+
+        Parameters
+        ----------
+        run_control_data: PnsRunControlData
+            Red/amber/green/blue/white LED unit operation patterns, buzzer mode
+        """
+        # Create the data to be sent (the header is already in the frame)
+        run_control_data.pack_into(self._run_frame, _HDR.size)
+
+        # Send PNS command (the response is only returned once the whole frame has been received)
+        recv_data = await self.send_command(self._run_frame, 1)
+
+        # check the response data
+        _check_ack(recv_data[0])
+
+    async def clear(self) -> None:
+        """
+        Send clear command for PNS command
+        """
+        recv_data = await self.send_command(_CLEAR_PACKET, 1)
+
+        # check the response data
+        _check_ack(recv_data[0])
+
+    async def get_data(self) -> 'PnsStatusData':
+        """
+        Send status acquisition command for PNS command
+
+        Returns
+        -------
+        status_data: PnsStatusData
+            Received data of status acquisition command (status of LED unit and buzzer)
+        """
+        recv_data = await self.send_command(_GET_PACKET, 6)
+
+        # check the response data
+        if recv_data[0] == PNS_NAK:
+            raise ValueError('negative acknowledge')
+
+        return PnsStatusData(recv_data)
+
+
+def main() -> None:
     args = sys.argv
-    argc = len(sys.argv)
-    
+
+    if len(args) >= 3 and args[1] == 'F':
+        # persistent mode: read commands line by line from a FIFO / file
+        run_server(args[2])
+    elif len(args) >= 4 and args[1] == 'M':
+        # send the same command to several LR5-LAN concurrently (comma separated IP addresses)
+        asyncio.run(run_multi(args[2].split(','), args[3:]))
+    else:
+        run_once(args[1:])
+
+
+def run_once(args: List[str]) -> None:
+    """
+    Connect to LR5-LAN, execute one command and close the connection
+
+    Parameters
+    ----------
+    args: List[str]
+        command and its arguments (e.g. ['S', '1', '0', '0', '0', '0', '0'])
+    """
+    # Connect to LR5-LAN
+    socket_open('192.168.10.1', PNS_DEFAULT_PORT)
+
+    try:
+        dispatch(args)
+
+    finally:
+        # Close the socket
+        socket_close()
+
+
+def run_server(fifo_path: str) -> None:
+    """
+    Connect to LR5-LAN once and execute the commands read from a FIFO / file
+
+    One command is written per line in the same format as the command line arguments (e.g. "S 1 0 0 0 0 0").
+    A line that cannot be executed (invalid arguments, NAK response) is reported to stderr and skipped.
+    The connection is kept open for all commands. A FIFO is reopened when its last writer closes it,
+    so the worker keeps running until it is stopped; a regular file is read to the end once.
+
+    Parameters
+    ----------
+    fifo_path: str
+        path of the FIFO / file to read commands from
+    """
     # Connect to LR5-LAN
-    socket_open('192.168.10.1', 10000)
+    socket_open('192.168.10.1', PNS_DEFAULT_PORT)
 
     try:
-        if args[1] == 'S':
-            # operation control command
-            if argc >= 8:
-                run_control_data = PnsRunControlData(
-                    int(args[2]),
-                    int(args[3]),
-                    int(args[4]),
-                    int(args[5]),
-                    int(args[6]),
-                    int(args[7]),
-                )
-                pns_run_control_command(run_control_data)
-
-        elif args[1] == 'C':
-            # clear command
-            pns_clear_command()
-
-        elif args[1] == 'G':
-            # get status command
-            status_data = pns_get_data_command()
-            # Display acquired data
-            print("Response data for status acquisition command")
-            # LED Red pattern
-            print("LED Red pattern :" + str(status_data.ledPattern[0]))
-            # LED Amber pattern
-            print("LED Amber pattern :" + str(status_data.ledPattern[1]))
-            # LED Green pattern
-            print("LED Green pattern :" + str(status_data.ledPattern[2]))
-            # LED Blue pattern
-            print("LED Blue pattern :" + str(status_data.ledPattern[3]))
-            # LED White pattern
-            print("LED White pattern :" + str(status_data.ledPattern[4]))
-            # buzzer mode
-            print("buzzer mode :" + str(status_data.buzzer))
+        is_fifo = stat.S_ISFIFO(os.stat(fifo_path).st_mode)
+        while True:
+            with open(fifo_path) as fifo:
+                for line in fifo:
+                    args = line.split()
+                    if not args:
+                        continue
+                    try:
+                        dispatch(args)
+                    except ValueError as e:
+                        sys.stderr.write(f"{line.strip()}: {e}\n")
+
+            if not is_fifo:
+                break
 
     finally:
         # Close the socket
         socket_close()
 
 
-def socket_open(ip: str, port: int):
+async def run_multi(hosts: List[str], args: List[str]) -> None:
+    """
+    Execute one command on several LR5-LAN concurrently
+
+    Parameters
+    ----------
+    hosts: List[str]
+        IP addresses of LR5-LAN
+    args: List[str]
+        command and its arguments (e.g. ['S', '1', '0', '0', '0', '0', '0'])
+
+    An error on one LR5-LAN (e.g. connection refused, NAK) is reported to stderr for that host
+    and does not affect the others.
+    """
+    results = await asyncio.gather(*(_run_client(host, args) for host in hosts), return_exceptions=True)
+
+    for host, result in zip(hosts, results):
+        if isinstance(result, Exception):
+            sys.stderr.write(f"{host}: {result!r}\n")
+        elif isinstance(result, BaseException):
+            raise result
+        elif result is not None:
+            print(host)
+            _print_status(result)
+
+
+async def _run_client(host: str, args: List[str]) -> Optional['PnsStatusData']:
+    handler = _ASYNC_DISPATCH.get(args[0])
+    if handler is None:
+        return None
+
+    async with PnsClient(host) as client:
+        return await handler(client, args)
+
+
+def dispatch(args: List[str]) -> None:
+    """
+    Execute one PNS command on the open connection
+
+    Parameters
+    ----------
+    args: List[str]
+        command and its arguments (e.g. ['S', '1', '0', '0', '0', '0', '0'])
+    """
+    handler = _DISPATCH.get(args[0])
+    if handler is not None:
+        handler(args)
+
+
+def _parse_run_args(args: List[str]) -> Optional[PnsRunControlData]:
+    # operation control data from the command arguments (None if they are missing)
+    if len(args) < 7:
+        return None
+    values = [int(arg) for arg in args[1:7]]
+    if not all(0 <= value <= 0xFF for value in values):
+        raise ValueError('pattern must be 0 to 255')
+    return PnsRunControlData(*values)
+
+
+def _handle_run(args: List[str]) -> None:
+    # operation control command
+    run_control_data = _parse_run_args(args)
+    if run_control_data is not None:
+        pns_run_control_command(run_control_data)
+
+
+def _handle_clear(args: List[str]) -> None:
+    # clear command
+    pns_clear_command()
+
+
+def _handle_get(args: List[str]) -> None:
+    # get status command (displayed straight from the receive buffer before the next command)
+    status_data = PnsStatusData(_get_connection()._get_data_view())
+    _print_status(status_data)
+
+
+def _print_status(status_data: 'PnsStatusData') -> None:
+    # Display acquired data in a single write
+    sys.stdout.write(
+        "Response data for status acquisition command\n"
+        f"LED Red pattern :{status_data[0]}\n"     # LED Red pattern
+        f"LED Amber pattern :{status_data[1]}\n"   # LED Amber pattern
+        f"LED Green pattern :{status_data[2]}\n"   # LED Green pattern
+        f"LED Blue pattern :{status_data[3]}\n"    # LED Blue pattern
+        f"LED White pattern :{status_data[4]}\n"   # LED White pattern
+        f"buzzer mode :{status_data.buzzer}\n"     # buzzer mode
+    )
+
+
+_DISPATCH = {
+    'S': _handle_run,
+    'C': _handle_clear,
+    'G': _handle_get,
+}
+"""command handler for each command character"""
+
+
+async def _handle_run_async(client: PnsClient, args: List[str]) -> Optional['PnsStatusData']:
+    # operation control command
+    run_control_data = _parse_run_args(args)
+    if run_control_data is not None:
+        await client.run_control(run_control_data)
+    return None
+
+
+async def _handle_clear_async(client: PnsClient, args: List[str]) -> Optional['PnsStatusData']:
+    # clear command
+    await client.clear()
+    return None
+
+
+async def _handle_get_async(client: PnsClient, args: List[str]) -> Optional['PnsStatusData']:
+    # get status command
+    return await client.get_data()
+
+
+_ASYNC_DISPATCH = {
+    'S': _handle_run_async,
+    'C': _handle_clear_async,
+    'G': _handle_get_async,
+}
+"""asyncio command handler for each command character"""
+
+
+_connection: Optional[PnsConnection] = None
+"""connection used by the module-level functions"""
+
+
+def _get_connection() -> PnsConnection:
+    if _connection is None:
+        raise ConnectionError('not connected to LR5-LAN')
+    return _connection
+
+
+def socket_open(ip: str, port: int) -> None:
     """
     Connect to LR5-LAN
 
@@ -186,17 +853,23 @@ def socket_open(ip: str, port: int):
     port: int
         port number
     """
-    _sock.connect((ip, port))
+    global _connection
+    # close the connection opened by an earlier socket_open()
+    if _connection is not None:
+        socket_close()
+    _connection = PnsConnection(ip, port)
 
 
-def socket_close():
+def socket_close() -> None:
     """
     Close the socket.
     """
-    _sock.close()
+    global _connection
+    _get_connection().close()
+    _connection = None
 
 
-def send_command(send_data: bytes) -> bytes:
+def send_command(send_data: Union[bytes, bytearray], expected_len: int) -> bytes:
     """
     Send command
 
@@ -204,22 +877,18 @@ def send_command(send_data: bytes) -> bytes:
     ----------
     send_data: bytes
         send data
+    expected_len: int
+        length of the response data (a NAK response is always 1 byte)
 
     Returns
     -------
     recv_data: bytes
         received data
     """
-    # Send
-    _sock.send(send_data)
+    return _get_connection().send_command(send_data, expected_len)
 
-    # Receive response data
-    recv_data = _sock.recv(1024)
 
-    return recv_data
-
-
-def pns_run_control_command(run_control_data: PnsRunControlData):
+def pns_run_control_command(run_control_data: PnsRunControlData) -> None:
     """
     Send operation control command for PNS command
 
@@ -234,42 +903,16 @@ def pns_run_control_command(run_control_data: PnsRunControlData):
         Pattern of LED unit (off: 0, on: 1, blinking(slow): 2, blinking(medium): 3, blinking(high): 4, flashing single: 5, flashing double: 6, flashing triple: 7, no change: 9)
         Buzzer pattern (Stop: 0, Ring: 1, no change: 9)
     """
-    # Create the data to be sent
-    send_data = struct.pack(
-        '>2ssxH',                   # format
-        PNS_PRODUCT_ID,             # Product Category (AB)
-        PNS_RUN_CONTROL_COMMAND,    # Command identifier (S)
-        6,                          # Data size
-    )
-    send_data += run_control_data.get_bytes()
-
-    # Send PNS command
-    recv_data = send_command(send_data)
+    _get_connection().run_control(run_control_data)
 
-    # check the response data
-    if recv_data[0] == PNS_NAK:
-        raise ValueError('negative acknowledge')
 
-def pns_clear_command():
+def pns_clear_command() -> None:
     """
     Send clear command for PNS command
 
     Turn off the LED unit and stop the buzzer
     """
-    # Create the data to be sent
-    send_data = struct.pack(
-        '>2ssxH',           # format
-        PNS_PRODUCT_ID,     # Product Category (AB)
-        PNS_CLEAR_COMMAND,  # Command identifier (C)
-        0,                  # Data size
-    )
-
-    # Send PNS command
-    recv_data = send_command(send_data)
-
-    # check the response data
-    if recv_data[0] == PNS_NAK:
-        raise ValueError('negative acknowledge')
+    _get_connection().clear()
 
 
 def pns_get_data_command() -> 'PnsStatusData':
@@ -283,24 +926,21 @@ def pns_get_data_command() -> 'PnsStatusData':
     status_data: PnsStatusData
         Received data of status acquisition command (status of LED unit and buzzer)
     """
-    # Create the data to be sent
-    send_data = struct.pack(
-        '>2ssxH',               # format
-        PNS_PRODUCT_ID,         # Product Category (AB)
-        PNS_GET_DATA_COMMAND,   # Command identifier (G)
-        0,                      # Data size
-    )
+    return _get_connection().get_data()
 
-    # Send PNS command
-    recv_data = send_command(send_data)
 
-    # check the response data
-    if recv_data[0] == PNS_NAK:
-        raise ValueError('negative acknowledge')
+def pns_run_sequence_command(frames: Sequence[Sequence[int]]) -> None:
+    """
+    Send the operation control commands of a whole LED sequence for PNS command
 
-    status_data = PnsStatusData(recv_data)
+    The commands are built in one buffer by build_sequence() and sent in a single write
 
-    return status_data
+    Parameters
+    ----------
+    frames: Sequence[Sequence[int]]
+        N frames of 6 values each (LED Red/Amber/Green/Blue/White pattern, buzzer mode)
+    """
+    _get_connection().run_sequence(build_sequence(frames))
 
 
 if __name__ == '__main__':